@@ -19,6 +19,8 @@ import re
 import textwrap
 from typing import Any, Callable, Optional
 
+import toml
+
 from streamlit.errors import DeprecationError
 from streamlit import util
 
@@ -164,6 +166,7 @@ class ConfigOption:
         self.deprecated = deprecated
         self.replaced_by = replaced_by
         self._get_val_func: Optional[Callable[[], Any]] = None
+        self._default_toml_cache: Optional[str] = None
         self.where_defined = ConfigOption.DEFAULT_DEFINITION
         self.type = type_
 
@@ -212,6 +215,18 @@ class ConfigOption:
         """Get the value of this config option."""
         return None if self._get_val_func is None else self._get_val_func()
 
+    @property
+    def _default_toml(self) -> str:
+        """The default value rendered as TOML, or "" if it can't be rendered.
+
+        The default never changes after the option is registered, so the
+        (slow) TOML serialization only happens once per option.
+        """
+        if self._default_toml_cache is None:
+            toml_default = toml.dumps({"default": self.default_val})
+            self._default_toml_cache = toml_default[10:].strip()
+        return self._default_toml_cache
+
     def set_value(self, value: Any, where_defined: Optional[str] = None) -> None:
         """Set the value of this option.
 
@@ -1,5 +1,8 @@
+import functools
+import io
 import toml
-from typing import Dict
+from collections import defaultdict
+from typing import Any, DefaultDict, Dict, List, Tuple
 
 import click
 
@@ -23,6 +26,21 @@ def server_option_changed(
     return False
 
 
+def _style_affixes(**styles: Any) -> Tuple[str, str]:
+    """Return the (prefix, suffix) ANSI codes that click.style wraps text in."""
+    prefix, suffix = click.style("X", **styles).split("X")
+    return prefix, suffix
+
+
+# show_config styles hundreds of lines, so compute the ANSI codes once rather
+# than calling click.style for every line.
+_DESC_PREFIX, _DESC_SUFFIX = _style_affixes(bold=True)
+_COMMENT_PREFIX, _COMMENT_SUFFIX = _style_affixes()
+_SECTION_PREFIX, _SECTION_SUFFIX = _style_affixes(bold=True, fg="green")
+_SETTING_PREFIX, _SETTING_SUFFIX = _style_affixes(fg="green")
+_DEPRECATED = click.style("DEPRECATED.", fg="yellow")
+
+
 def show_config(
     section_descriptions: Dict[str, str],
     config_options: Dict[str, ConfigOption],
@@ -30,8 +48,8 @@ def show_config(
     """Print the given config sections/options to the terminal."""
     SKIP_SECTIONS = ("_test",)
 
-    out = []
-    out.append(
+    buf = io.StringIO()
+    buf.write(
         _clean(
             """
         # Below are all the sections and options you can have in
@@ -39,93 +57,117 @@ def show_config(
     """
         )
     )
+    buf.write("\n")
 
-    def append_desc(text):
-        out.append(click.style(text, bold=True))
-
-    def append_comment(text):
-        out.append(click.style(text))
-
-    def append_section(text):
-        out.append(click.style(text, bold=True, fg="green"))
+    # Group the visible options by section up front, rather than scanning
+    # every option once per section.
+    options_by_section: DefaultDict[str, List[ConfigOption]] = defaultdict(list)
+    for option in config_options.values():
+        if option.visibility == "hidden":
+            continue
 
-    def append_setting(text):
-        out.append(click.style(text, fg="green"))
+        if option.is_expired():
+            continue
 
-    def append_newline():
-        out.append("")
+        options_by_section[option.section].append(option)
 
     for section, section_description in section_descriptions.items():
         if section in SKIP_SECTIONS:
             continue
 
-        append_newline()
-        append_section("[%s]" % section)
-        append_newline()
-
-        for key, option in config_options.items():
-            if option.section != section:
-                continue
-
-            if option.visibility == "hidden":
-                continue
-
-            if option.is_expired():
-                continue
+        buf.write("\n")
+        buf.write(f"{_SECTION_PREFIX}[{section}]{_SECTION_SUFFIX}\n")
+        buf.write("\n")
 
+        for option in options_by_section.get(section, ()):
             key = option.key.split(".")[1]
-            description_paragraphs = _clean_paragraphs(option.description)
+            description_paragraphs = _cached_clean_paragraphs(option.description)
 
             for i, txt in enumerate(description_paragraphs):
                 if i == 0:
-                    append_desc("# %s" % txt)
+                    buf.write(f"{_DESC_PREFIX}# {txt}{_DESC_SUFFIX}\n")
                 else:
-                    append_comment("# %s" % txt)
+                    buf.write(f"{_COMMENT_PREFIX}# {txt}{_COMMENT_SUFFIX}\n")
 
-            toml_default = toml.dumps({"default": option.default_val})
-            toml_default = toml_default[10:].strip()
+            toml_default = option._default_toml
 
             if len(toml_default) > 0:
-                append_comment("# Default: %s" % toml_default)
+                buf.write(
+                    f"{_COMMENT_PREFIX}# Default: {toml_default}{_COMMENT_SUFFIX}\n"
+                )
             else:
                 # Don't say "Default: (unset)" here because this branch applies
                 # to complex config settings too.
                 pass
 
             if option.deprecated:
-                append_comment("#")
-                append_comment("# " + click.style("DEPRECATED.", fg="yellow"))
-                append_comment(
-                    "# %s" % "\n".join(_clean_paragraphs(option.deprecation_text))
+                deprecation_text = "\n# ".join(
+                    _cached_clean_paragraphs(option.deprecation_text)
                 )
-                append_comment(
-                    "# This option will be removed on or after %s."
-                    % option.expiration_date
+                buf.write(f"{_COMMENT_PREFIX}#{_COMMENT_SUFFIX}\n")
+                buf.write(f"{_COMMENT_PREFIX}# {_DEPRECATED}{_COMMENT_SUFFIX}\n")
+                buf.write(f"{_COMMENT_PREFIX}# {deprecation_text}{_COMMENT_SUFFIX}\n")
+                buf.write(
+                    f"{_COMMENT_PREFIX}# This option will be removed on or after "
+                    f"{option.expiration_date}.{_COMMENT_SUFFIX}\n"
                 )
-                append_comment("#")
+                buf.write(f"{_COMMENT_PREFIX}#{_COMMENT_SUFFIX}\n")
 
             option_is_manually_set = (
                 option.where_defined != ConfigOption.DEFAULT_DEFINITION
             )
 
             if option_is_manually_set:
-                append_comment("# The value below was set in %s" % option.where_defined)
+                buf.write(
+                    f"{_COMMENT_PREFIX}# The value below was set in "
+                    f"{option.where_defined}{_COMMENT_SUFFIX}\n"
+                )
 
-            toml_setting = toml.dumps({key: option.value})
+            toml_setting = _toml_setting(key, option.value)
 
             if len(toml_setting) == 0:
-                toml_setting = "#%s =\n" % key
+                toml_setting = f"#{key} =\n"
 
-            append_setting(toml_setting)
+            buf.write(f"{_SETTING_PREFIX}{toml_setting}{_SETTING_SUFFIX}\n")
 
-    click.echo("\n".join(out))
+    # Every line above is newline-terminated, so don't let click add another.
+    click.echo(buf.getvalue(), nl=False)
+
+
+def _toml_setting(key: str, value: Any) -> str:
+    """Render a single `key = value` TOML line.
+
+    Common scalar values are formatted inline, since toml.dumps is slow.
+    Everything else falls back to toml.dumps.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return f"{key} = {'true' if value else 'false'}\n"
+    if isinstance(value, int):
+        return f"{key} = {value}\n"
+    if (
+        isinstance(value, str)
+        and value.isprintable()
+        and '"' not in value
+        and "\\" not in value
+    ):
+        return f'{key} = "{value}"\n'
+    return toml.dumps({key: value})
 
 
 def _clean(txt):
     """Replace all whitespace with a single space."""
-    return " ".join(txt.split()).strip()
+    return " ".join(txt.split())
 
 
 def _clean_paragraphs(txt):
     paragraphs = txt.split("\n\n")
     return [_clean(x) for x in paragraphs]
+
+
+@functools.lru_cache(maxsize=512)
+def _cached_clean_paragraphs(txt: str) -> Tuple[str, ...]:
+    """Like _clean_paragraphs, but cached. Option descriptions never change,
+    so show_config only needs to clean each of them once."""
+    return tuple(_clean_paragraphs(txt))
@@ -15,11 +15,12 @@
 """A Python wrapper around Vega-Lite."""
 
 import json
-from typing import Any, Dict, Optional, cast
+from typing import Any, Dict, FrozenSet, Optional, cast
 
 import streamlit
 import streamlit.elements.lib.dicttools as dicttools
 from streamlit.logger import get_logger
+from streamlit.proto.Arrow_pb2 import Arrow as ArrowProto
 from streamlit.proto.ArrowVegaLiteChart_pb2 import (
     ArrowVegaLiteChart as ArrowVegaLiteChartProto,
 )
@@ -29,6 +30,15 @@ from .arrow import Data
 
 LOGGER = get_logger(__name__)
 
+try:
+    # Specs can embed large amounts of inline data, and orjson serializes
+    # them much faster than the json module. It's an optional dependency.
+    import orjson
+
+    _orjson_available = True
+except ImportError:
+    _orjson_available = False
+
 
 class ArrowVegaLiteMixin:
     def _arrow_vega_lite_chart(
@@ -42,9 +52,10 @@ class ArrowVegaLiteMixin:
 
         Parameters
         ----------
-        data : pandas.DataFrame, pandas.Styler, pyarrow.Table, numpy.ndarray, Iterable, dict, or None
+        data : pandas.DataFrame, pandas.Styler, pyarrow.Table, numpy.ndarray, Iterable, dict, bytes, or None
             Either the data to be plotted or a Vega-Lite spec containing the
-            data (which more closely follows the Vega-Lite API).
+            data (which more closely follows the Vega-Lite API). Bytes are
+            treated as already-serialized Arrow IPC data and sent as is.
 
         spec : dict or None
             The Vega-Lite spec for the chart. If the spec was already passed in
@@ -122,18 +133,25 @@ def marshall(
     # Support passing no spec arg, but filling it with kwargs.
     # Example:
     #   marshall(proto, baz='boz')
-    spec = dict() if spec is None else dict(spec)
+    # A spec passed in by the caller must not be modified, but copying it is
+    # wasteful for large specs, so we only copy it right before changing it.
+    owns_spec = spec is None
+    spec = dict() if spec is None else spec
     # Support passing in kwargs. Example:
     #   marshall(proto, {foo: 'bar'}, baz='boz')
     if len(kwargs):
         # Merge spec with unflattened kwargs, where kwargs take precedence.
         # This only works for string keys, but kwarg keys are strings anyways.
         spec = dict(spec, **dicttools.unflatten(kwargs, _CHANNELS))
+        owns_spec = True
 
     if not spec:
         raise ValueError("Vega-Lite charts require a non-empty spec dict.")
 
     if "autosize" not in spec:
+        if not owns_spec:
+            spec = dict(spec)
+            owns_spec = True
         spec["autosize"] = {"type": "fit", "contains": "padding"}
 
     # Pull data out of spec dict when it's in a 'datasets' key:
@@ -143,7 +161,10 @@ def marshall(
             dataset = proto.datasets.add()
             dataset.name = str(k)
             dataset.has_name = True
-            arrow.marshall(dataset.data, v)
+            _marshall_data(dataset.data, v)
+        if not owns_spec:
+            spec = dict(spec)
+            owns_spec = True
         del spec["datasets"]
 
     # Pull data out of spec dict when it's in a top-level 'data' key:
@@ -157,28 +178,59 @@ def marshall(
         if isinstance(data_spec, dict):
             if "values" in data_spec:
                 data = data_spec["values"]
-                del spec["data"]
+                remove_data_spec = True
+            else:
+                remove_data_spec = False
         else:
             data = data_spec
+            remove_data_spec = True
+
+        if remove_data_spec:
+            if not owns_spec:
+                spec = dict(spec)
             del spec["data"]
 
-    proto.spec = json.dumps(spec)
+    proto.spec = _dumps_spec(spec)
     proto.use_container_width = use_container_width
 
     if data is not None:
-        arrow.marshall(proto.data, data)
+        _marshall_data(proto.data, data)
+
+
+def _marshall_data(proto: ArrowProto, data: Data) -> None:
+    """Marshall chart data into an Arrow proto.
+
+    Data that is already serialized to Arrow IPC bytes (e.g. computed once and
+    cached by the app) is copied into the proto without being converted again.
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        proto.data = bytes(data)
+    else:
+        arrow.marshall(proto, data)
+
+
+def _dumps_spec(spec: Dict[str, Any]) -> str:
+    """Serialize a Vega-Lite spec to a JSON string."""
+    if _orjson_available:
+        try:
+            return cast(str, orjson.dumps(spec).decode("utf-8"))
+        except TypeError:
+            # orjson is stricter than json (e.g. it rejects non-string keys),
+            # so fall back to json for anything it can't serialize.
+            pass
+    return json.dumps(spec)
 
 
 # See https://vega.github.io/vega-lite/docs/encoding.html
-_CHANNELS = set(
-    [
+_CHANNELS: FrozenSet[str] = frozenset(
+    {
         "x",
         "y",
         "x2",
         "y2",
         "xError",
-        "yError2",
-        "xError",
+        "xError2",
+        "yError",
         "yError2",
         "longitude",
         "latitude",
@@ -198,5 +250,5 @@ _CHANNELS = set(
         "facet",
         "row",
         "column",
-    ]
+    }
 )
@@ -124,11 +124,12 @@ def marshall(
         Otherwise, never show a scrollbar.
 
     """
-    if src is not None:
-        proto.src = src
-
+    # src and srcdoc share a oneof in the proto, so only set the one that
+    # will be kept.
     if srcdoc is not None:
         proto.srcdoc = srcdoc
+    elif src is not None:
+        proto.src = src
 
     if width is not None:
         proto.width = width
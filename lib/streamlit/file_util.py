@@ -14,8 +14,11 @@
 
 import contextlib
 import errno
+import functools
 import io
 import os
+import re
+from typing import Pattern, Tuple
 
 import fnmatch
 
@@ -26,6 +29,14 @@ from streamlit.string_util import is_binary_string
 # Configuration and credentials are stored inside the ~/.streamlit folder
 CONFIG_FOLDER_NAME = ".streamlit"
 
+# How many leading bytes get_encoded_file_data inspects to detect binary data.
+_BINARY_SNIFF_LENGTH = 8192
+
+# The static folders ship with the package, so their paths never change.
+_STREAMLIT_DIR = os.path.dirname(os.path.normpath(__file__))
+_STATIC_DIR = os.path.normpath(os.path.join(_STREAMLIT_DIR, "static"))
+_ASSETS_DIR = os.path.normpath(os.path.join(_STREAMLIT_DIR, "static/assets"))
+
 
 def get_encoded_file_data(data, encoding="auto"):
     """Coerce bytes to a BytesIO or a StringIO.
@@ -43,7 +54,16 @@ def get_encoded_file_data(data, encoding="auto"):
 
     """
     if encoding == "auto":
-        encoding = None if is_binary_string(data) else "utf-8"
+        # Like git, only sniff the start of the data to decide whether it's
+        # binary, so large files aren't scanned in full.
+        if is_binary_string(data[:_BINARY_SNIFF_LENGTH]):
+            return io.BytesIO(data)
+        # The sample only tells us the data looks like text. Binary data
+        # past the sample will fail to decode.
+        try:
+            return io.StringIO(data.decode("utf-8"))
+        except UnicodeDecodeError:
+            return io.BytesIO(data)
     if encoding:
         return io.StringIO(data.decode(encoding))
 
@@ -65,13 +85,16 @@ def streamlit_read(path, binary=False):
     binary - set to True for binary IO
     """ % CONFIG_FOLDER_NAME
     filename = get_streamlit_file_path(path)
-    if os.stat(filename).st_size == 0:
-        raise util.Error('Read zero byte file: "%s"' % filename)
 
     mode = "r"
     if binary:
         mode += "b"
-    with open(os.path.join(CONFIG_FOLDER_NAME, path), mode) as handle:
+    with open(filename, mode) as handle:
+        # Detect empty files by reading from the open handle, rather than
+        # with a separate stat call.
+        if not handle.read(1):
+            raise util.Error('Read zero byte file: "%s"' % filename)
+        handle.seek(0)
         yield handle
 
 
@@ -110,14 +133,12 @@ def streamlit_write(path, binary=False):
 
 def get_static_dir():
     """Get the folder where static HTML/JS/CSS files live."""
-    dirname = os.path.dirname(os.path.normpath(__file__))
-    return os.path.normpath(os.path.join(dirname, "static"))
+    return _STATIC_DIR
 
 
 def get_assets_dir():
     """Get the folder where static assets live."""
-    dirname = os.path.dirname(os.path.normpath(__file__))
-    return os.path.normpath(os.path.join(dirname, "static/assets"))
+    return _ASSETS_DIR
 
 
 def get_streamlit_file_path(*filepath) -> str:
@@ -141,6 +162,17 @@ def get_project_streamlit_file_path(*filepath):
     return os.path.join(os.getcwd(), CONFIG_FOLDER_NAME, *filepath)
 
 
+@functools.lru_cache(maxsize=256)
+def compile_folder_glob(folderpath_glob: str) -> Pattern[str]:
+    """Compile a folder glob into a regex that matches "<dir>/" strings of
+    directories inside that folder."""
+    # Make the glob always end with "/*" so we match files inside subfolders of
+    # folderpath_glob.
+    if not folderpath_glob.endswith("*"):
+        folderpath_glob += "*" if folderpath_glob.endswith("/") else "/*"
+    return re.compile(fnmatch.translate(os.path.normcase(folderpath_glob)))
+
+
 def file_is_in_folder_glob(filepath, folderpath_glob) -> bool:
     """Test whether a file is in some folder with globbing support.
 
@@ -152,12 +184,21 @@ def file_is_in_folder_glob(filepath, folderpath_glob) -> bool:
         A path to a folder that may include globbing.
 
     """
-    # Make the glob always end with "/*" so we match files inside subfolders of
-    # folderpath_glob.
-    if not folderpath_glob.endswith("*"):
-        folderpath_glob += "*" if folderpath_glob.endswith("/") else "/*"
-    file_dir = f'{os.path.dirname(filepath)}/'
-    return fnmatch.fnmatch(file_dir, folderpath_glob)
+    file_dir = os.path.normcase(f"{os.path.dirname(filepath)}/")
+    return compile_folder_glob(folderpath_glob).match(file_dir) is not None
+
+
+@functools.lru_cache(maxsize=8)
+def _compile_pythonpath_globs(pythonpath: str, cwd: str) -> Tuple[Pattern[str], ...]:
+    """Compile the folder globs for each entry in a PYTHONPATH string.
+
+    The cwd is passed in (rather than read here) so that relative entries are
+    recompiled if the working directory changes.
+    """
+    return tuple(
+        compile_folder_glob(os.path.normpath(os.path.join(cwd, path)))
+        for path in pythonpath.split(os.pathsep)
+    )
 
 
 def file_in_pythonpath(filepath) -> bool:
@@ -180,8 +221,6 @@ def file_in_pythonpath(filepath) -> bool:
     if len(pythonpath) == 0:
         return False
 
-    absolute_paths = [os.path.abspath(path) for path in pythonpath.split(os.pathsep)]
-    return any(
-        file_is_in_folder_glob(os.path.normpath(filepath), path)
-        for path in absolute_paths
-    )
+    globs = _compile_pythonpath_globs(pythonpath, os.getcwd())
+    file_dir = os.path.normcase(f"{os.path.dirname(os.path.normpath(filepath))}/")
+    return any(glob.match(file_dir) is not None for glob in globs)
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import os
+import re
 
 from streamlit import util
 from streamlit import file_util
@@ -34,6 +35,14 @@ DEFAULT_FOLDER_BLACKLIST = [
     "**/virtualenv",
 ]
 
+# Characters that give a glob a meaning beyond a plain folder name.
+_GLOB_SPECIAL_CHARS_RE = re.compile(r"[*?\[\]/\\]")
+
+
+def _is_folder_name(glob: str) -> bool:
+    """True if the glob can only match a single folder with that exact name."""
+    return len(glob) > 0 and _GLOB_SPECIAL_CHARS_RE.search(glob) is None
+
 
 class FolderBlackList(object):
     """Implement a black list object with globbing.
@@ -62,6 +71,30 @@ class FolderBlackList(object):
         if config.get_option("global.developmentMode"):
             self._folder_blacklist.append(os.path.dirname(__file__))
 
+        # Most globs blacklist a folder name (or name prefix) anywhere in the
+        # path, like "**/venv" or "**/.*". Those are checked with a set lookup
+        # on the path's folder names, which is much cheaper than matching a
+        # regex. The remaining globs are compiled once here and matched in turn.
+        folder_names = set()
+        folder_name_prefixes = set()
+        other_globs = []
+        for blacklisted_folder in self._folder_blacklist:
+            if blacklisted_folder.startswith("**/"):
+                name = blacklisted_folder[3:]
+                if _is_folder_name(name):
+                    folder_names.add(os.path.normcase(name))
+                    continue
+                if name.endswith("*") and _is_folder_name(name[:-1]):
+                    folder_name_prefixes.add(os.path.normcase(name[:-1]))
+                    continue
+            other_globs.append(blacklisted_folder)
+
+        self._blacklisted_folder_names = frozenset(folder_names)
+        self._blacklisted_folder_name_prefixes = tuple(folder_name_prefixes)
+        self._folder_blacklist_patterns = tuple(
+            file_util.compile_folder_glob(glob) for glob in dict.fromkeys(other_globs)
+        )
+
     def __repr__(self) -> str:
         return util.repr_(self)
 
@@ -74,7 +107,19 @@ class FolderBlackList(object):
             File path that we intend to test.
 
         """
+        # Normalize the path the same way file_util.file_is_in_folder_glob does.
+        file_dir = os.path.normcase(f"{os.path.dirname(filepath)}/")
+
+        # The globs match "/<name>/" anywhere in file_dir, so skip the part
+        # before the first separator.
+        folder_names = file_dir.split(os.sep)[1:-1]
+        if not self._blacklisted_folder_names.isdisjoint(folder_names):
+            return True
+        prefixes = self._blacklisted_folder_name_prefixes
+        if prefixes and any(name.startswith(prefixes) for name in folder_names):
+            return True
+
         return any(
-            file_util.file_is_in_folder_glob(filepath, blacklisted_folder)
-            for blacklisted_folder in self._folder_blacklist
+            pattern.match(file_dir) is not None
+            for pattern in self._folder_blacklist_patterns
         )
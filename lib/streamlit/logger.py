@@ -16,7 +16,7 @@
 
 import logging
 import sys
-from typing import Dict, Union
+from typing import Dict, Optional, Union
 
 from streamlit import config
 
@@ -28,24 +28,36 @@ LOG_LEVEL = logging.INFO
 
 DEFAULT_LOG_MESSAGE = "%(asctime)s %(levelname) -7s " "%(name)s: %(message)s"
 
+# The console formatter shared by all loggers, and the format it was built with.
+_formatter: Optional[logging.Formatter] = None
+_formatter_message_format: Optional[str] = None
+
+# Maps the level names and constants accepted by set_log_level to the
+# corresponding logging constant.
+_LOG_LEVELS: Dict[Union[str, int], int] = {
+    "CRITICAL": logging.CRITICAL,
+    logging.CRITICAL: logging.CRITICAL,
+    "ERROR": logging.ERROR,
+    logging.ERROR: logging.ERROR,
+    "WARNING": logging.WARNING,
+    logging.WARNING: logging.WARNING,
+    "INFO": logging.INFO,
+    logging.INFO: logging.INFO,
+    "DEBUG": logging.DEBUG,
+    logging.DEBUG: logging.DEBUG,
+}
+
 
 def set_log_level(level: Union[str, int]) -> None:
     """Set log level."""
     logger = get_logger(__name__)
 
-    if isinstance(level, str):
+    log_level = _LOG_LEVELS.get(level)
+    if log_level is None and isinstance(level, str):
+        # Only uppercase the name if it wasn't passed in uppercase already.
         level = level.upper()
-    if level in ["CRITICAL", logging.CRITICAL]:
-        log_level = logging.CRITICAL
-    elif level in ["ERROR", logging.ERROR]:
-        log_level = logging.ERROR
-    elif level in ["WARNING", logging.WARNING]:
-        log_level = logging.WARNING
-    elif level in ["INFO", logging.INFO]:
-        log_level = logging.INFO
-    elif level in ["DEBUG", logging.DEBUG]:
-        log_level = logging.DEBUG
-    else:
+        log_level = _LOG_LEVELS.get(level)
+    if log_level is None:
         msg = 'undefined log level "%s"' % level
         logger.critical(msg)
         sys.exit(1)
@@ -73,15 +85,32 @@ def setup_formatter(logger: logging.Logger) -> None:
         message_format = config.get_option("logger.messageFormat")
     else:
         message_format = DEFAULT_LOG_MESSAGE
-    formatter = logging.Formatter(fmt=message_format)
-    formatter.default_msec_format = "%s.%03d"
+    formatter = _get_formatter(message_format)
     logger.streamlit_console_handler.setFormatter(formatter)  # type: ignore[attr-defined]
 
     # Register the new console logger.
     logger.addHandler(logger.streamlit_console_handler)  # type: ignore[attr-defined]
 
 
+def _get_formatter(message_format: Optional[str]) -> logging.Formatter:
+    """Return a console formatter for the given message format.
+
+    All loggers use the same format, so they share a single Formatter that is
+    only rebuilt when the format changes.
+    """
+    global _formatter, _formatter_message_format
+
+    if _formatter is None or message_format != _formatter_message_format:
+        _formatter = logging.Formatter(fmt=message_format)
+        _formatter.default_msec_format = "%s.%03d"
+        _formatter_message_format = message_format
+    return _formatter
+
+
 def update_formatter() -> None:
+    global _formatter
+    _formatter = None
+
     for log in LOGGERS.values():
         setup_formatter(log)
 
@@ -113,8 +142,9 @@ def get_logger(name: str) -> logging.Logger:
     Logger
 
     """
-    if name in LOGGERS.keys():
-        return LOGGERS[name]
+    logger = LOGGERS.get(name)
+    if logger is not None:
+        return logger
 
     logger = logging.getLogger() if name == "root" else logging.getLogger(name)
     logger.setLevel(LOG_LEVEL)
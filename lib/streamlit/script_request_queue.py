@@ -15,7 +15,7 @@
 import threading
 from collections import deque
 from enum import Enum
-from typing import Any, Optional, Tuple, Deque, Iterable, Callable, TypeVar
+from typing import Any, Optional, Tuple, Deque
 
 import attr
 
@@ -50,12 +50,15 @@ class ScriptRequestQueue:
     def __init__(self):
         self._lock = threading.Lock()
         self._queue: Deque[Tuple[ScriptRequest, Any]] = deque()
+        # RERUN requests are coalesced, so there's at most one in the queue.
+        # We track its index so we don't need to search for it.
+        self._rerun_index: Optional[int] = None
 
     @property
     def has_request(self) -> bool:
         """True if the queue has at least one element"""
-        with self._lock:
-            return len(self._queue) > 0
+        # len() on a deque is atomic, so this doesn't need the lock.
+        return len(self._queue) > 0
 
     def enqueue(self, request: ScriptRequest, data: Any = None) -> None:
         """Enqueue a new request to the end of the queue.
@@ -75,18 +78,20 @@ class ScriptRequestQueue:
         """
 
         with self._lock:
-            if request == ScriptRequest.SHUTDOWN:
+            if request is ScriptRequest.SHUTDOWN:
                 # If we get a shutdown request, it jumps to the front of the
                 # queue to be processed immediately.
                 self._queue.appendleft((request, data))
+                if self._rerun_index is not None:
+                    self._rerun_index += 1
                 return
 
-            if request == ScriptRequest.RERUN:
+            if request is ScriptRequest.RERUN:
                 # RERUN requests are special - if there's an existing rerun
                 # request in the queue, we try to coalesce this one into it
                 # to avoid having redundant RERUNS.
-                index = _index_if(self._queue, lambda item: item[0] == request)
-                if index >= 0:
+                index = self._rerun_index
+                if index is not None:
                     _, old_data = self._queue[index]
 
                     if old_data.widget_states is None:
@@ -95,13 +100,8 @@ class ScriptRequestQueue:
                         # recent script execution's widget state was.
                         # We have no meaningful state to merge with, and
                         # so we simply overwrite the existing request.
-                        self._queue[index] = (
-                            request,
-                            RerunData(
-                                query_string=data.query_string,
-                                widget_states=data.widget_states,
-                            ),
-                        )
+                        # (RerunData is immutable, so it's safe to reuse.)
+                        self._queue[index] = (request, data)
                         return
 
                     if data.widget_states is not None:
@@ -125,6 +125,8 @@ class ScriptRequestQueue:
 
             # Base case: add the request to the end of the queue.
             self._queue.append((request, data))
+            if request is ScriptRequest.RERUN:
+                self._rerun_index = len(self._queue) - 1
 
     def dequeue(self) -> Tuple[Optional[ScriptRequest], Any]:
         """Pops the front-most request from the queue and returns it.
@@ -135,19 +137,18 @@ class ScriptRequestQueue:
         -------
         A (ScriptRequest, Data) tuple.
         """
-        with self._lock:
-            return self._queue.popleft() if len(self._queue) > 0 else (None, None)
-
-
-T = TypeVar("T")
-
+        # Checking for emptiness is atomic, so the common "nothing to do"
+        # case doesn't need to take the lock. Popping still does, since it
+        # must stay consistent with the RERUN bookkeeping in enqueue.
+        if len(self._queue) == 0:
+            return None, None
 
-def _index_if(collection: Iterable[T], pred: Callable[[T], bool]) -> int:
-    """Find the index of the first item in a collection for which a predicate is true.
-
-    Returns the index, or -1 if no such item exists.
-    """
-    return next(
-        (index for index, element in enumerate(collection) if pred(element)),
-        -1,
-    )
+        with self._lock:
+            if len(self._queue) == 0:
+                return None, None
+
+            if self._rerun_index is not None:
+                self._rerun_index = (
+                    None if self._rerun_index == 0 else self._rerun_index - 1
+                )
+            return self._queue.popleft()
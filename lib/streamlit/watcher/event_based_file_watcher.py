@@ -150,6 +150,9 @@ class _MultiFileWatcher(object):
         with self._lock:
             folder_handler = self._folder_handlers.get(folder_path)
 
+            # All files in a folder share a single observer watch. Events for
+            # files nobody is watching are dropped by a dict lookup in
+            # _FolderEventHandler, so they never wake up any callbacks.
             if folder_handler is None:
                 folder_handler = _FolderEventHandler()
                 self._folder_handlers[folder_path] = folder_handler
@@ -12,11 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from concurrent.futures import ThreadPoolExecutor
 import os
+import stat
 import sys
-import collections
+import sysconfig
+import threading
+import time
 import types
-from typing import Callable, Dict, List, Optional, Set
+import weakref
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
 
 from streamlit import config
 from streamlit import file_util
@@ -31,7 +36,27 @@ from streamlit.watcher.file_watcher import (
 
 LOGGER = get_logger(__name__)
 
-WatchedModule = collections.namedtuple("WatchedModule", ["watcher", "module_name"])
+# Editors and tools like `git checkout` often change several files in quick
+# succession. The first file change is handled immediately, but further changes
+# within this many seconds of it are coalesced into a single rerun...
+FILE_CHANGE_DEBOUNCE_SECS = 0.1
+# ...which is delayed by at most this many seconds, however many changes come in.
+FILE_CHANGE_MAX_DELAY_SECS = 0.5
+
+# When at least this many new modules aren't in _MODULE_PATHS_CACHE yet (e.g.
+# on the first session's first run), their paths are looked up in parallel.
+# That's mostly stat calls, which release the GIL.
+_MIN_MODULES_TO_SCAN_IN_PARALLEL = 64
+_MAX_SCAN_WORKERS = 8
+
+# The folders of the standard library and of installed packages.
+_LIBRARY_PATH_PREFIXES: Tuple[str, ...] = tuple(
+    {
+        os.path.normcase(os.path.join(path, ""))
+        for key, path in sysconfig.get_paths().items()
+        if key in ("stdlib", "platstdlib", "purelib", "platlib")
+    }
+)
 
 # This needs to be initialized lazily to avoid calling config.get_option() and
 # thus initializing config options when this file is first imported.
@@ -44,12 +69,56 @@ class LocalSourcesWatcher:
         self._on_file_changed: List[Callable[[], None]] = []
         self._is_closed = False
 
+        # Guards the debouncing state below, and the sys.modules bookkeeping
+        # used by update_watched_modules, since file change events come in on
+        # the file watchers' threads.
+        self._lock = threading.Lock()
+        self._last_fire_time = float("-inf")
+        self._first_deferred_time: Optional[float] = None
+        self._debounce_timer: Optional[threading.Timer] = None
+
         # Blacklist for folders that should not be watched
         self._folder_black_list = FolderBlackList(
             config.get_option("server.folderWatchBlacklist")
         )
 
-        self._watched_modules: Dict[str, WatchedModule] = {}
+        # Maps each watched file's path to the name of the module it belongs
+        # to, and to its file watcher. They're kept in separate dicts since
+        # on_file_changed only needs the module names.
+        self._watched_module_names: Dict[str, Optional[str]] = {}
+        self._watchers: Dict[str, Any] = {}
+
+        # The script folder never changes, so normalize it once for the
+        # prefix check in _file_is_in_script_folder.
+        self._script_folder_prefix = os.path.normcase(
+            os.path.join(self._session_data.script_folder, "")
+        )
+
+        # Modules from the standard library and installed packages are never
+        # watched, so we don't even scan them for paths. That is, unless the
+        # script folder or PYTHONPATH overlaps with their folders.
+        watched_folders = [self._script_folder_prefix] + [
+            os.path.normcase(os.path.join(os.path.abspath(path), ""))
+            for path in os.environ.get("PYTHONPATH", "").split(os.pathsep)
+            if path
+        ]
+        self._library_path_prefixes = tuple(
+            prefix
+            for prefix in _LIBRARY_PATH_PREFIXES
+            if not any(
+                prefix.startswith(folder) or folder.startswith(prefix)
+                for folder in watched_folders
+            )
+        )
+
+        # The ids and names of the modules in sys.modules at the last call to
+        # update_watched_modules. Scanning modules for paths hits the
+        # filesystem, so we skip it when sys.modules hasn't changed, and
+        # otherwise only scan the modules that are new since then.
+        self._cached_module_ids: FrozenSet[int] = frozenset()
+        self._seen_module_names: Set[str] = set()
+        # The size of sys.modules at the last call to update_watched_modules.
+        self._last_num_modules = -1
 
         self._register_watcher(
             self._session_data.main_script_path,
@@ -60,10 +129,54 @@ class LocalSourcesWatcher:
         self._on_file_changed.append(cb)
 
     def on_file_changed(self, filepath):
-        if filepath not in self._watched_modules:
+        if filepath not in self._watched_module_names:
             LOGGER.error("Received event for non-watched file: %s", filepath)
             return
 
+        with self._lock:
+            now = time.monotonic()
+            if (
+                self._debounce_timer is None
+                and now - self._last_fire_time > FILE_CHANGE_DEBOUNCE_SECS
+            ):
+                self._last_fire_time = now
+                fire_now = True
+            else:
+                # Coalesce this change with the others that came in recently.
+                fire_now = False
+                if self._debounce_timer is not None:
+                    self._debounce_timer.cancel()
+                if self._first_deferred_time is None:
+                    self._first_deferred_time = now
+                delay = min(
+                    FILE_CHANGE_DEBOUNCE_SECS,
+                    self._first_deferred_time + FILE_CHANGE_MAX_DELAY_SECS - now,
+                )
+                self._debounce_timer = threading.Timer(
+                    max(delay, 0), self._on_debounce_timer
+                )
+                self._debounce_timer.daemon = True
+                self._debounce_timer.start()
+
+        if fire_now:
+            self._handle_file_changed()
+
+    def _on_debounce_timer(self):
+        with self._lock:
+            # We may have been canceled or replaced by a newer timer after we
+            # started waiting on the lock.
+            if (
+                self._is_closed
+                or self._debounce_timer is not threading.current_thread()
+            ):
+                return
+            self._debounce_timer = None
+            self._first_deferred_time = None
+            self._last_fire_time = time.monotonic()
+
+        self._handle_file_changed()
+
+    def _handle_file_changed(self):
         # Workaround:
         # Delete all watched modules so we can guarantee changes to the
         # updated module are reflected on reload.
@@ -76,17 +189,32 @@ class LocalSourcesWatcher:
         # However, determining all import paths for a given loaded module is
         # non-trivial, and so as a workaround we simply unload all watched
         # modules.
-        for wm in self._watched_modules.values():
-            if wm.module_name is not None and wm.module_name in sys.modules:
-                del sys.modules[wm.module_name]
+        with self._lock:
+            for module_name in self._watched_module_names.values():
+                if module_name is not None:
+                    sys.modules.pop(module_name, None)
+                    # Rescan the module when it's reimported, in case its paths
+                    # changed.
+                    self._seen_module_names.discard(module_name)
+
+            # The next run will reimport the modules we just unloaded, possibly
+            # leaving the size of sys.modules unchanged, so make sure
+            # update_watched_modules doesn't skip them.
+            self._last_num_modules = -1
 
         for cb in self._on_file_changed:
             cb()
 
     def close(self):
-        for wm in self._watched_modules.values():
-            wm.watcher.close()
-        self._watched_modules = {}
+        with self._lock:
+            if self._debounce_timer is not None:
+                self._debounce_timer.cancel()
+                self._debounce_timer = None
+
+        for watcher in self._watchers.values():
+            watcher.close()
+        self._watched_module_names = {}
+        self._watchers = {}
         self._is_closed = True
 
     def _register_watcher(self, filepath, module_name):
@@ -98,35 +226,36 @@ class LocalSourcesWatcher:
             return
 
         try:
-            wm = WatchedModule(
-                watcher=FileWatcher(filepath, self.on_file_changed),
-                module_name=module_name,
-            )
+            watcher = FileWatcher(filepath, self.on_file_changed)
         except PermissionError:
             # If you don't have permission to read this file, don't even add it
             # to watchers.
             return
 
-        self._watched_modules[filepath] = wm
+        self._watched_module_names[filepath] = module_name
+        self._watchers[filepath] = watcher
 
     def _deregister_watcher(self, filepath):
-        if filepath not in self._watched_modules:
+        if filepath not in self._watched_module_names:
             return
 
         if filepath == self._session_data.main_script_path:
             return
 
-        wm = self._watched_modules[filepath]
-        wm.watcher.close()
-        del self._watched_modules[filepath]
+        self._watchers.pop(filepath).close()
+        del self._watched_module_names[filepath]
 
     def _file_is_new(self, filepath):
-        return filepath not in self._watched_modules
+        return filepath not in self._watched_module_names
+
+    def _file_is_in_script_folder(self, filepath):
+        file_dir = os.path.normcase(os.path.join(os.path.dirname(filepath), ""))
+        return file_dir.startswith(self._script_folder_prefix)
 
     def _file_should_be_watched(self, filepath):
         # Using short circuiting for performance.
         return self._file_is_new(filepath) and (
-            file_util.file_is_in_folder_glob(filepath, self._session_data.script_folder)
+            self._file_is_in_script_folder(filepath)
             or file_util.file_in_pythonpath(filepath)
         )
 
@@ -134,46 +263,151 @@ class LocalSourcesWatcher:
         if self._is_closed:
             return
 
+        # The lock keeps on_file_changed from unloading modules, and resetting
+        # the state below, while we take our snapshot.
+        with self._lock:
+            # Modules are rarely unloaded, except by on_file_changed, so if the
+            # number of loaded modules hasn't changed then nothing new has been
+            # imported. This check is much cheaper than comparing module ids.
+            num_modules = len(sys.modules)
+            if num_modules == self._last_num_modules:
+                return
+            self._last_num_modules = num_modules
+
+            # Snapshot sys.modules, since other threads may import modules
+            # while we're iterating. The ids are taken before the names so that
+            # a module imported in between is scanned now, rather than missed
+            # next time.
+            module_ids = frozenset(map(id, list(sys.modules.values())))
+
+            if module_ids == self._cached_module_ids:
+                return
+            self._cached_module_ids = module_ids
+
+            module_names = set(sys.modules)
+            new_module_names = module_names - self._seen_module_names
+            self._seen_module_names = module_names
+
+        names_to_scan = []
+        modules_to_scan = []
+        for name in new_module_names:
+            module = sys.modules.get(name)
+            if module is None or self._is_library_module(module):
+                continue
+            names_to_scan.append(name)
+            modules_to_scan.append(module)
+
+        # Cached paths are cheap to look up, so only the misses count towards
+        # whether it's worth starting threads.
+        num_uncached = sum(
+            id(module) not in _MODULE_PATHS_CACHE for module in modules_to_scan
+        )
+        if num_uncached >= _MIN_MODULES_TO_SCAN_IN_PARALLEL:
+            with ThreadPoolExecutor(max_workers=_MAX_SCAN_WORKERS) as executor:
+                scanned_paths = list(executor.map(get_module_paths, modules_to_scan))
+        else:
+            scanned_paths = [get_module_paths(module) for module in modules_to_scan]
+
+        # Filtering and registering watchers stays on this thread.
         modules_paths = {
-            name: self._exclude_blacklisted_paths(get_module_paths(module))
-            for name, module in dict(sys.modules).items()
+            name: self._exclude_blacklisted_paths(paths)
+            for name, paths in zip(names_to_scan, scanned_paths)
         }
 
         self._register_necessary_watchers(modules_paths)
 
-    def _register_necessary_watchers(self, module_paths: Dict[str, Set[str]]) -> None:
+    def _is_library_module(self, module: types.ModuleType) -> bool:
+        try:
+            module_file = module.__file__
+        except Exception:
+            # Let get_module_paths deal with (and warn about) this module.
+            return False
+        return isinstance(module_file, str) and os.path.normcase(
+            module_file
+        ).startswith(self._library_path_prefixes)
+
+    def _register_necessary_watchers(
+        self, module_paths: Dict[str, FrozenSet[str]]
+    ) -> None:
         for name, paths in module_paths.items():
             for path in paths:
                 if self._file_should_be_watched(path):
                     self._register_watcher(path, name)
 
-    def _exclude_blacklisted_paths(self, paths: Set[str]) -> Set[str]:
-        return {p for p in paths if not self._folder_black_list.is_blacklisted(p)}
+    def _exclude_blacklisted_paths(self, paths: FrozenSet[str]) -> FrozenSet[str]:
+        is_blacklisted = self._folder_black_list.is_blacklisted
+        return frozenset(p for p in paths if not is_blacklisted(p))
+
+
+# Maps id(module) to the paths we found for that module. A module's paths don't
+# change after it's imported, and every session's LocalSourcesWatcher looks them
+# up. Entries are evicted when their module is garbage collected, so a reused id
+# can't return stale paths.
+_MODULE_PATHS_CACHE: Dict[int, FrozenSet[str]] = {}
 
 
-def get_module_paths(module: types.ModuleType) -> Set[str]:
-    paths_extractors = [
-        lambda m: [m.__file__],
-        lambda m: [m.__spec__.origin],
-        lambda m: list(m.__path__._path),
-    ]
+# Most modules lack at least one of these attributes, so they're looked up with
+# getattr defaults rather than by catching AttributeError.
+_PATHS_EXTRACTORS: Tuple[Callable[[types.ModuleType], Any], ...] = (
+    lambda m: [getattr(m, "__file__", None)],
+    lambda m: [getattr(getattr(m, "__spec__", None), "origin", None)],
+    # Namespace packages keep their folders in __path__._path.
+    lambda m: getattr(getattr(m, "__path__", None), "_path", ()),
+)
+
 
+def get_module_paths(module: types.ModuleType) -> FrozenSet[str]:
+    module_id = id(module)
+    cached_paths = _MODULE_PATHS_CACHE.get(module_id)
+    if cached_paths is not None:
+        return cached_paths
 
-    all_paths = set()
-    for extract_paths in paths_extractors:
+    all_paths: Set[str] = set()
+    cacheable = True
+    for extract_paths in _PATHS_EXTRACTORS:
         potential_paths = []
         try:
             potential_paths = extract_paths(module)
-        except AttributeError:
-            pass
         except Exception as e:
+            # Don't cache the result, so that we don't hide this warning on
+            # later lookups.
+            cacheable = False
             LOGGER.warning(f"Examining the path of {module.__name__} raised: {e}")
 
+        # Paths are interned, since the same ones are kept around by the cache
+        # and by every session's watcher.
         all_paths.update(
-            [os.path.abspath(str(p)) for p in potential_paths if _is_valid_path(p)]
+            sys.intern(_absolute_path(p)) for p in potential_paths if _is_valid_path(p)
         )
-    return all_paths
+
+    module_paths = frozenset(all_paths)
+    if cacheable:
+        try:
+            weakref.finalize(module, _evict_module_paths, module_id)
+        except TypeError:
+            # The module can't be weakly referenced, so we'd have no way of
+            # evicting it from the cache.
+            return module_paths
+        _MODULE_PATHS_CACHE[module_id] = module_paths
+    return module_paths
+
+
+def _evict_module_paths(module_id: int) -> None:
+    _MODULE_PATHS_CACHE.pop(module_id, None)
+
+
+def _absolute_path(path: str) -> str:
+    # os.path.abspath calls os.getcwd, which is a syscall. Module paths are
+    # usually absolute already, in which case normalizing them is enough.
+    return os.path.normpath(path) if os.path.isabs(path) else os.path.abspath(path)
 
 
 def _is_valid_path(path: Optional[str]) -> bool:
-    return isinstance(path, str) and (os.path.isfile(path) or os.path.isdir(path))
+    if not isinstance(path, str):
+        return False
+    # A single stat call, rather than one each for isfile and isdir.
+    try:
+        mode = os.stat(path).st_mode
+    except (OSError, ValueError):
+        return False
+    return stat.S_ISREG(mode) or stat.S_ISDIR(mode)
@@ -51,3 +51,39 @@ class FileIsInFolderTest(unittest.TestCase):
 
         self.assertFalse(is_blacklisted("/foo/not_blacklisted/script.py"))
         self.assertFalse(is_blacklisted("/foo/not_blacklisted/.hidden_script.py"))
+
+    def test_do_not_blacklist_sibling_of_user_configured_folder(self):
+        """
+        Folders whose names merely start with a blacklisted folder's name
+        should not be blacklisted.
+        """
+        folder_black_list = FolderBlackList(["/bar/some_folder", "**/build"])
+        is_blacklisted = folder_black_list.is_blacklisted
+
+        self.assertTrue(is_blacklisted("/bar/some_folder/sub/script.py"))
+        self.assertTrue(is_blacklisted("/foo/build/script.py"))
+        self.assertFalse(is_blacklisted("/bar/some_folder2/script.py"))
+        self.assertFalse(is_blacklisted("/foo/builder/script.py"))
+
+    def test_blacklist_user_configured_globs(self):
+        """
+        Files inside folders matching user configured globs should be
+        blacklisted.
+        """
+        folder_black_list = FolderBlackList(["**/tmp*", "/bar/*/baz"])
+        is_blacklisted = folder_black_list.is_blacklisted
+
+        self.assertTrue(is_blacklisted("/foo/tmp/script.py"))
+        self.assertTrue(is_blacklisted("/foo/tmp_files/sub/script.py"))
+        self.assertTrue(is_blacklisted("/bar/qux/baz/script.py"))
+        self.assertFalse(is_blacklisted("/foo/not_tmp/script.py"))
+        self.assertFalse(is_blacklisted("/bar/qux/script.py"))
+        self.assertFalse(is_blacklisted("tmp/script.py"))
+
+    def test_blacklist_duplicated_globs(self):
+        """Duplicated user configured globs should not break the blacklist."""
+        folder_black_list = FolderBlackList(["**/foo/bar", "**/foo/bar"])
+        is_blacklisted = folder_black_list.is_blacklisted
+
+        self.assertTrue(is_blacklisted("/x/foo/bar/script.py"))
+        self.assertFalse(is_blacklisted("/x/foo/script.py"))
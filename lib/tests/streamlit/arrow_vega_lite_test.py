@@ -13,12 +13,14 @@
 # limitations under the License.
 
 import json
+from unittest.mock import MagicMock, patch
 
 import pandas as pd
 import pyarrow as pa
 from tests import testutil
 
 import streamlit as st
+from streamlit.elements import arrow_vega_lite
 from streamlit.type_util import bytes_to_data_frame, pyarrow_table_to_bytes
 
 df1 = pd.DataFrame([["A", "B", "C", "D"], [28, 55, 43, 91]], index=["a", "b"]).T
@@ -107,6 +109,18 @@ class ArrowVegaLiteTest(testutil.DeltaGeneratorTestCase):
             merge_dicts(autosize_spec, {"data": {"name": "foo"}, "mark": "rect"}),
         )
 
+    def test_spec_not_modified(self):
+        """Test that the spec passed in by the caller is left untouched."""
+        spec = {"mark": "rect", "datasets": {"foo": df1}, "data": {"values": df2}}
+        st._arrow_vega_lite_chart(spec)
+
+        self.assertEqual(["mark", "datasets", "data"], list(spec.keys()))
+
+        proto = self.get_delta_from_queue().new_element.arrow_vega_lite_chart
+        self.assertDictEqual(
+            json.loads(proto.spec), merge_dicts(autosize_spec, {"mark": "rect"})
+        )
+
     def test_dict_unflatten(self):
         """Test passing a spec as keywords."""
         st._arrow_vega_lite_chart(df1, x="foo", boink_boop=100, baz={"boz": "booz"})
@@ -127,6 +141,26 @@ class ArrowVegaLiteTest(testutil.DeltaGeneratorTestCase):
             ),
         )
 
+    def test_error_channels_unflatten(self):
+        """Test that all error channel keywords are moved into the encoding."""
+        st._arrow_vega_lite_chart(df1, xError="a", xError2="b", yError="a", yError2="b")
+
+        proto = self.get_delta_from_queue().new_element.arrow_vega_lite_chart
+        self.assertDictEqual(
+            json.loads(proto.spec),
+            merge_dicts(
+                autosize_spec,
+                {
+                    "encoding": {
+                        "xError": "a",
+                        "xError2": "b",
+                        "yError": "a",
+                        "yError2": "b",
+                    }
+                },
+            ),
+        )
+
     def test_pyarrow_table_data(self):
         """Test that you can pass pyarrow.Table as data."""
         table = pa.Table.from_pandas(df1)
@@ -137,6 +171,14 @@ class ArrowVegaLiteTest(testutil.DeltaGeneratorTestCase):
         self.assertEqual(proto.HasField("data"), True)
         self.assertEqual(proto.data.data, pyarrow_table_to_bytes(table))
 
+    def test_serialized_arrow_data(self):
+        """Test that already-serialized Arrow bytes are passed through as is."""
+        data = pyarrow_table_to_bytes(pa.Table.from_pandas(df1))
+        st._arrow_vega_lite_chart(data, {"mark": "rect"})
+
+        proto = self.get_delta_from_queue().new_element.arrow_vega_lite_chart
+        self.assertEqual(proto.data.data, data)
+
     def test_arrow_add_rows(self):
         """Test that you can call _arrow_add_rows on arrow_vega_lite_chart (with data)."""
         chart = st._arrow_vega_lite_chart(df1, {"mark": "rect"})
@@ -186,6 +228,36 @@ class ArrowVegaLiteTest(testutil.DeltaGeneratorTestCase):
             merge_dicts(autosize_spec, {"mark": "rect", "width": 200}),
         )
 
+    @patch("streamlit.elements.arrow_vega_lite._orjson_available", False)
+    def test_dumps_spec_with_json(self):
+        """Test that specs are serialized to JSON when orjson isn't installed."""
+        spec = {"mark": "rect", "width": 200, "encoding": {"x": {"field": "a"}}}
+        self.assertDictEqual(spec, json.loads(arrow_vega_lite._dumps_spec(spec)))
+
+    @patch("streamlit.elements.arrow_vega_lite._orjson_available", True)
+    def test_dumps_spec_with_orjson(self):
+        """Test that specs are serialized with orjson when it's installed, and
+        with json when orjson can't serialize them."""
+
+        def orjson_dumps(obj):
+            # Like orjson, reject non-string keys.
+            if any(not isinstance(key, str) for key in obj):
+                raise TypeError("Dict key must be str")
+            return json.dumps(obj).encode("utf-8")
+
+        orjson = MagicMock()
+        orjson.dumps.side_effect = orjson_dumps
+
+        with patch("streamlit.elements.arrow_vega_lite.orjson", orjson, create=True):
+            spec = {"mark": "rect", "width": 200, "encoding": {"x": {"field": "a"}}}
+            self.assertDictEqual(spec, json.loads(arrow_vega_lite._dumps_spec(spec)))
+            orjson.dumps.assert_called_once_with(spec)
+
+            # Non-string keys aren't supported by orjson, but are by json.
+            self.assertDictEqual(
+                {"1": "a"}, json.loads(arrow_vega_lite._dumps_spec({1: "a"}))
+            )
+
 
 def merge_dicts(x, y):
     z = x.copy()
@@ -13,10 +13,11 @@
 # limitations under the License.
 
 """st.memo unit tests."""
+import io
 import pickle
 import re
 import unittest
-from unittest.mock import patch, mock_open, MagicMock, Mock
+from unittest.mock import patch, MagicMock, Mock
 
 import streamlit as st
 from streamlit import StreamlitAPIException, file_util
@@ -144,16 +145,15 @@ class MemoPersistTest(unittest.TestCase):
         )
         self.assertIsNotNone(match)
 
-    @patch("streamlit.file_util.os.stat", MagicMock())
     @patch(
         "streamlit.file_util.open",
-        mock_open(read_data=pickle.dumps("mock_pickled_value")),
+        side_effect=lambda *args: io.BytesIO(pickle.dumps("mock_pickled_value")),
     )
     @patch(
         "streamlit.caching.memo_decorator.streamlit_read",
         wraps=file_util.streamlit_read,
     )
-    def test_read_persisted_data(self, mock_read):
+    def test_read_persisted_data(self, mock_read, _):
         """We should read persisted data from disk on cache miss."""
 
         @st.experimental_memo(persist="disk")
@@ -164,13 +164,15 @@ class MemoPersistTest(unittest.TestCase):
         mock_read.assert_called_once()
         self.assertEqual("mock_pickled_value", data)
 
-    @patch("streamlit.file_util.os.stat", MagicMock())
-    @patch("streamlit.file_util.open", mock_open(read_data="bad_pickled_value"))
+    @patch(
+        "streamlit.file_util.open",
+        side_effect=lambda *args: io.StringIO("bad_pickled_value"),
+    )
     @patch(
         "streamlit.caching.memo_decorator.streamlit_read",
         wraps=file_util.streamlit_read,
     )
-    def test_read_bad_persisted_data(self, mock_read):
+    def test_read_bad_persisted_data(self, mock_read, _):
         """If our persisted data is bad, we raise an exception."""
 
         @st.experimental_memo(persist="disk")
@@ -211,10 +213,9 @@ class MemoPersistTest(unittest.TestCase):
             st.experimental_memo.clear()
             mock_rmtree.assert_not_called()
 
-    @patch("streamlit.file_util.os.stat", MagicMock())
     @patch(
         "streamlit.file_util.open",
-        wraps=mock_open(read_data=pickle.dumps("mock_pickled_value")),
+        side_effect=lambda *args: io.BytesIO(pickle.dumps("mock_pickled_value")),
     )
     @patch("streamlit.caching.memo_decorator.os.remove")
     def test_clear_one_disk_cache(self, mock_os_remove: Mock, mock_open: Mock):
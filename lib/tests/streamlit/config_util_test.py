@@ -18,6 +18,7 @@ import textwrap
 import unittest
 
 from parameterized import parameterized
+import toml
 
 from streamlit import config_util
 from streamlit import config
@@ -106,3 +107,23 @@ class ConfigUtilTest(unittest.TestCase):
         self.assertEqual(
             config_util.server_option_changed(old_options, new_options), changed
         )
+
+    @parameterized.expand(
+        [
+            (None,),
+            (True,),
+            (False,),
+            (8501,),
+            ("localhost",),
+            ('has "quotes"',),
+            ("back\\slash",),
+            ("new\nline",),
+            (1.5,),
+            (["a", "b"],),
+        ]
+    )
+    def test_toml_setting(self, value):
+        """_toml_setting should produce the same output as toml.dumps."""
+        self.assertEqual(
+            toml.dumps({"key": value}), config_util._toml_setting("key", value)
+        )
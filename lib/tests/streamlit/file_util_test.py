@@ -14,6 +14,7 @@
 
 from unittest.mock import patch, mock_open, MagicMock
 import errno
+import io
 import os
 import pytest
 import unittest
@@ -27,34 +28,28 @@ mock_get_path = MagicMock(return_value=FILENAME)
 
 
 class FileUtilTest(unittest.TestCase):
-    def setUp(self):
-        self.patch1 = patch("streamlit.file_util.os.stat")
-        self.os_stat = self.patch1.start()
-
-    def tearDown(self):
-        self.patch1.stop()
-
     @patch("streamlit.file_util.get_streamlit_file_path", mock_get_path)
-    @patch("streamlit.file_util.open", mock_open(read_data="data"))
-    def test_streamlit_read(self):
+    @patch("streamlit.file_util.open", return_value=io.StringIO("data"))
+    def test_streamlit_read(self, mock_open_file):
         """Test streamlitfile_util.streamlit_read."""
         with file_util.streamlit_read(FILENAME) as input:
             data = input.read()
         self.assertEqual("data", data)
+        mock_open_file.assert_called_once_with(FILENAME, "r")
 
     @patch("streamlit.file_util.get_streamlit_file_path", mock_get_path)
-    @patch("streamlit.file_util.open", mock_open(read_data=b"\xaa\xbb"))
-    def test_streamlit_read_binary(self):
+    @patch("streamlit.file_util.open", return_value=io.BytesIO(b"\xaa\xbb"))
+    def test_streamlit_read_binary(self, mock_open_file):
         """Test streamlitfile_util.streamlit_read."""
         with file_util.streamlit_read(FILENAME, binary=True) as input:
             data = input.read()
         self.assertEqual(b"\xaa\xbb", data)
+        mock_open_file.assert_called_once_with(FILENAME, "rb")
 
     @patch("streamlit.file_util.get_streamlit_file_path", mock_get_path)
-    @patch("streamlit.file_util.open", mock_open(read_data="data"))
-    def test_streamlit_read_zero_bytes(self):
+    @patch("streamlit.file_util.open", return_value=io.StringIO(""))
+    def test_streamlit_read_zero_bytes(self, _):
         """Test streamlitfile_util.streamlit_read."""
-        self.os_stat.return_value.st_size = 0
         with pytest.raises(util.Error) as e:
             with file_util.streamlit_read(FILENAME) as input:
                 data = input.read()
@@ -157,6 +152,31 @@ class FileIsInFolderTest(unittest.TestCase):
         self.assertTrue(ret)
 
 
+class GetEncodedFileDataTest(unittest.TestCase):
+    def test_text_data(self):
+        data = file_util.get_encoded_file_data("héllo".encode("utf-8"))
+        self.assertIsInstance(data, io.StringIO)
+        self.assertEqual("héllo", data.getvalue())
+
+    def test_binary_data(self):
+        data = file_util.get_encoded_file_data(b"\x00\x01\x02")
+        self.assertIsInstance(data, io.BytesIO)
+        self.assertEqual(b"\x00\x01\x02", data.getvalue())
+
+    def test_only_start_of_data_is_sniffed(self):
+        data = file_util.get_encoded_file_data(b"a" * 8192 + b"\x00")
+        self.assertIsInstance(data, io.StringIO)
+
+    def test_binary_data_after_sniffed_sample(self):
+        data = file_util.get_encoded_file_data(b"a" * 8192 + b"\xff\x00")
+        self.assertIsInstance(data, io.BytesIO)
+        self.assertEqual(b"a" * 8192 + b"\xff\x00", data.getvalue())
+
+    def test_explicit_encoding(self):
+        data = file_util.get_encoded_file_data(b"\x00\x01", encoding="latin-1")
+        self.assertIsInstance(data, io.StringIO)
+
+
 class FileInPythonPathTest(unittest.TestCase):
     @staticmethod
     def _make_it_absolute(path):
@@ -60,6 +60,20 @@ class LoggerTest(unittest.TestCase):
             logger.set_log_level(k)
             self.assertEqual(k, logging.getLogger().getEffectiveLevel())
 
+    @parameterized.expand(
+        [
+            ("CRITICAL", logging.CRITICAL),
+            ("error", logging.ERROR),
+            ("Warning", logging.WARNING),
+            ("INFO", logging.INFO),
+            ("debug", logging.DEBUG),
+        ]
+    )
+    def test_set_log_level_by_name(self, name, level):
+        """Test streamlit.logger.set_log_level with level names."""
+        logger.set_log_level(name)
+        self.assertEqual(level, logger.LOG_LEVEL)
+
     def test_set_log_level_error(self):
         """Test streamlit.logger.set_log_level."""
         with pytest.raises(SystemExit) as e:
@@ -110,6 +124,24 @@ class LoggerTest(unittest.TestCase):
                     LOGGER.handlers[0].formatter._fmt, logger.DEFAULT_LOG_MESSAGE
                 )
 
+    def test_loggers_share_formatter(self):
+        """Test that loggers share a formatter until the format changes."""
+        logger1 = logger.get_logger("test_shared_formatter1")
+        logger2 = logger.get_logger("test_shared_formatter2")
+        logger.update_formatter()
+
+        self.assertIs(
+            logger1.streamlit_console_handler.formatter,
+            logger2.streamlit_console_handler.formatter,
+        )
+
+        formatter = logger._get_formatter("%(message)s")
+        self.assertIs(formatter, logger._get_formatter("%(message)s"))
+
+        other_formatter = logger._get_formatter("%(name)s: %(message)s")
+        self.assertIsNot(formatter, other_formatter)
+        self.assertEqual("%(name)s: %(message)s", other_formatter._fmt)
+
     def test_init_tornado_logs(self):
         """Test streamlit.logger.init_tornado_logs."""
         logger.init_tornado_logs()
@@ -148,3 +148,30 @@ class ScriptRequestQueueTest(unittest.TestCase):
 
         # We should have no more events
         self.assertEqual((None, None), queue.dequeue(), "Expected empty event queue")
+
+    def test_rerun_coalescing_after_shutdown_and_dequeue(self):
+        """A pending RERUN is still found and coalesced after other requests
+        are pushed in front of it or popped from the queue."""
+        queue = ScriptRequestQueue()
+
+        queue.enqueue(ScriptRequest.STOP)
+        queue.enqueue(ScriptRequest.RERUN, RerunData(query_string="1"))
+        queue.enqueue(ScriptRequest.SHUTDOWN)
+        queue.enqueue(ScriptRequest.RERUN, RerunData(query_string="2"))
+
+        self.assertEqual(ScriptRequest.SHUTDOWN, queue.dequeue()[0])
+        self.assertEqual(ScriptRequest.STOP, queue.dequeue()[0])
+
+        queue.enqueue(ScriptRequest.RERUN, RerunData(query_string="3"))
+
+        event, data = queue.dequeue()
+        self.assertEqual(ScriptRequest.RERUN, event)
+        self.assertEqual("3", data.query_string)
+        self.assertEqual((None, None), queue.dequeue())
+
+        # With the old RERUN gone, a new one is enqueued normally.
+        queue.enqueue(ScriptRequest.STOP)
+        queue.enqueue(ScriptRequest.RERUN, RerunData(query_string="4"))
+        self.assertEqual(ScriptRequest.STOP, queue.dequeue()[0])
+        self.assertEqual("4", queue.dequeue()[1].query_string)
+        self.assertEqual((None, None), queue.dequeue())
@@ -15,8 +15,10 @@
 """streamlit.LocalSourcesWatcher unit test."""
 
 from unittest.mock import MagicMock, patch
+import gc
 import os
 import sys
+import types
 import unittest
 
 from streamlit import config
@@ -86,6 +88,83 @@ class LocalSourcesWatcherTest(unittest.TestCase):
 
         self.assertEqual(fob.call_count, 1)  # __init__.py
 
+    @patch(
+        "streamlit.watcher.local_sources_watcher.get_module_paths",
+        return_value=set(),
+    )
+    @patch("streamlit.watcher.local_sources_watcher.FileWatcher")
+    def test_skips_scan_if_sys_modules_unchanged(self, fob, get_module_paths, _):
+        lso = local_sources_watcher.LocalSourcesWatcher(REPORT)
+        lso.register_file_change_callback(NOOP_CALLBACK)
+
+        lso.update_watched_modules()
+        get_module_paths.assert_called()
+
+        get_module_paths.reset_mock()
+        lso.update_watched_modules()
+        get_module_paths.assert_not_called()
+
+        # Only the newly imported module gets scanned.
+        sys.modules["DUMMY_MODULE_1"] = DUMMY_MODULE_1
+        lso.update_watched_modules()
+        get_module_paths.assert_called_once_with(DUMMY_MODULE_1)
+
+    @patch("streamlit.watcher.local_sources_watcher.FileWatcher")
+    def test_rescans_reloaded_modules(self, fob, _):
+        lso = local_sources_watcher.LocalSourcesWatcher(REPORT)
+        lso.register_file_change_callback(NOOP_CALLBACK)
+
+        with patch(
+            "streamlit.watcher.local_sources_watcher.get_module_paths",
+            wraps=local_sources_watcher.get_module_paths,
+        ) as get_module_paths, patch("sys.modules", {"DUMMY_MODULE_1": DUMMY_MODULE_1}):
+            lso.update_watched_modules()
+            lso.on_file_changed(DUMMY_MODULE_1_FILE)
+            self.assertNotIn("DUMMY_MODULE_1", sys.modules)
+
+            # Reimporting the module leaves the size of sys.modules unchanged.
+            reloaded_module = types.ModuleType("DUMMY_MODULE_1")
+            reloaded_module.__file__ = DUMMY_MODULE_1_FILE
+            sys.modules["DUMMY_MODULE_1"] = reloaded_module
+
+            get_module_paths.reset_mock()
+            lso.update_watched_modules()
+            get_module_paths.assert_called_once_with(reloaded_module)
+
+    @patch(
+        "streamlit.watcher.local_sources_watcher.get_module_paths",
+        return_value=set(),
+    )
+    @patch("streamlit.watcher.local_sources_watcher.FileWatcher")
+    def test_skips_scan_of_library_modules(self, fob, get_module_paths, _):
+        lso = local_sources_watcher.LocalSourcesWatcher(REPORT)
+        lso.register_file_change_callback(NOOP_CALLBACK)
+
+        with patch(
+            "sys.modules", {"DUMMY_MODULE_1": DUMMY_MODULE_1, "unittest": unittest}
+        ):
+            lso.update_watched_modules()
+
+        get_module_paths.assert_called_once_with(DUMMY_MODULE_1)
+
+    @patch("streamlit.watcher.local_sources_watcher.FileWatcher")
+    def test_file_is_in_script_folder(self, fob, _):
+        lso = local_sources_watcher.LocalSourcesWatcher(REPORT)
+        script_folder = REPORT.script_folder
+
+        self.assertTrue(lso._file_is_in_script_folder(DUMMY_MODULE_1_FILE))
+        self.assertTrue(
+            lso._file_is_in_script_folder(os.path.join(script_folder, "a", "b.py"))
+        )
+        self.assertFalse(
+            lso._file_is_in_script_folder(os.path.join(script_folder + "2", "b.py"))
+        )
+        self.assertFalse(
+            lso._file_is_in_script_folder(
+                os.path.join(os.path.dirname(script_folder), "b.py")
+            )
+        )
+
     @patch("streamlit.watcher.local_sources_watcher.FileWatcher")
     def test_permission_error(self, fob, _):
         fob.side_effect = PermissionError("This error should be caught!")
@@ -125,6 +204,42 @@ class LocalSourcesWatcherTest(unittest.TestCase):
 
         self.assertEqual(fob.call_count, 0)
 
+    @patch(
+        "streamlit.watcher.local_sources_watcher._MIN_MODULES_TO_SCAN_IN_PARALLEL", 1
+    )
+    @patch.dict(local_sources_watcher._MODULE_PATHS_CACHE, clear=True)
+    @patch(
+        "streamlit.watcher.local_sources_watcher.ThreadPoolExecutor",
+        wraps=local_sources_watcher.ThreadPoolExecutor,
+    )
+    @patch("streamlit.watcher.local_sources_watcher.FileWatcher")
+    def test_uncached_modules_scanned_in_parallel(self, fob, executor, _):
+        lso = local_sources_watcher.LocalSourcesWatcher(REPORT)
+        lso.register_file_change_callback(NOOP_CALLBACK)
+
+        sys.modules["DUMMY_MODULE_1"] = DUMMY_MODULE_1
+        sys.modules["DUMMY_MODULE_2"] = DUMMY_MODULE_2
+
+        fob.reset_mock()
+        lso.update_watched_modules()
+
+        executor.assert_called_once()
+        self.assertEqual(fob.call_count, 3)  # dummy modules and __init__.py
+        watched_paths = sorted(args[0] for args, _ in fob.call_args_list)
+        self.assertTrue("__init__.py" in watched_paths[0])
+        self.assertEqual(watched_paths[1:], [DUMMY_MODULE_1_FILE, DUMMY_MODULE_2_FILE])
+
+        # Another session finds the same modules in the cache, so it doesn't
+        # need any threads to scan them.
+        executor.reset_mock()
+        fob.reset_mock()
+        lso2 = local_sources_watcher.LocalSourcesWatcher(REPORT)
+        lso2.register_file_change_callback(NOOP_CALLBACK)
+        lso2.update_watched_modules()
+
+        executor.assert_not_called()
+        self.assertEqual(fob.call_count, 4)  # script, dummy modules, __init__.py
+
     @patch("streamlit.watcher.local_sources_watcher.FileWatcher")
     def test_script_and_2_modules_in_series(self, fob, _):
         lso = local_sources_watcher.LocalSourcesWatcher(REPORT)
@@ -202,6 +317,51 @@ class LocalSourcesWatcherTest(unittest.TestCase):
             self.assertNotIn("NESTED_MODULE_CHILD", sys.modules)
             self.assertNotIn("NESTED_MODULE_PARENT", sys.modules)
 
+    # Use long delays and a fake clock, so that no timer can fire before the
+    # test expects it to, however slow the machine running the test is.
+    @patch("streamlit.watcher.local_sources_watcher.FILE_CHANGE_DEBOUNCE_SECS", 60)
+    @patch("streamlit.watcher.local_sources_watcher.FILE_CHANGE_MAX_DELAY_SECS", 60)
+    @patch("streamlit.watcher.local_sources_watcher.time")
+    @patch("streamlit.watcher.local_sources_watcher.FileWatcher")
+    def test_file_changes_are_debounced(self, fob, mock_time, _):
+        mock_time.monotonic.return_value = 100.0
+        callback = MagicMock()
+        lso = local_sources_watcher.LocalSourcesWatcher(REPORT)
+        lso.register_file_change_callback(callback)
+
+        # The first change is handled right away...
+        lso.on_file_changed(REPORT_PATH)
+        callback.assert_called_once()
+
+        # ...and the changes right after it are coalesced into a single call.
+        lso.on_file_changed(REPORT_PATH)
+        self.assertEqual(callback.call_count, 1)
+
+        # Once the max delay has passed, the next change schedules the
+        # coalesced call to run immediately.
+        mock_time.monotonic.return_value = 160.0
+        lso.on_file_changed(REPORT_PATH)
+        lso._debounce_timer.join()
+        self.assertEqual(callback.call_count, 2)
+
+    @patch("streamlit.watcher.local_sources_watcher.FILE_CHANGE_DEBOUNCE_SECS", 60)
+    @patch("streamlit.watcher.local_sources_watcher.FILE_CHANGE_MAX_DELAY_SECS", 60)
+    @patch("streamlit.watcher.local_sources_watcher.time")
+    @patch("streamlit.watcher.local_sources_watcher.FileWatcher")
+    def test_close_cancels_debounced_file_change(self, fob, mock_time, _):
+        mock_time.monotonic.return_value = 100.0
+        callback = MagicMock()
+        lso = local_sources_watcher.LocalSourcesWatcher(REPORT)
+        lso.register_file_change_callback(callback)
+
+        lso.on_file_changed(REPORT_PATH)
+        lso.on_file_changed(REPORT_PATH)
+        timer = lso._debounce_timer
+
+        lso.close()
+        timer.join()
+        callback.assert_called_once()
+
     @patch("streamlit.watcher.local_sources_watcher.FileWatcher")
     def test_config_blacklist(self, fob, _):
         """Test server.folderWatchBlacklist"""
@@ -266,7 +426,7 @@ class LocalSourcesWatcherTest(unittest.TestCase):
         lsw = local_sources_watcher.LocalSourcesWatcher(REPORT)
         lsw.register_file_change_callback(NOOP_CALLBACK)
         lsw.update_watched_modules()
-        self.assertEqual(len(lsw._watched_modules), 0)
+        self.assertEqual(len(lsw._watchers), 0)
 
     @patch("streamlit.watcher.local_sources_watcher.FileWatcher")
     def test_namespace_package_unloaded(self, fob, _):
@@ -299,5 +459,42 @@ def test_get_module_paths_outputs_abs_paths():
     assert module_paths == {DUMMY_MODULE_1_FILE}
 
 
+def test_get_module_paths_outputs_normalized_paths():
+    mock_module = MagicMock()
+    mock_module.__file__ = os.path.join(
+        os.path.dirname(DUMMY_MODULE_1_FILE), "..", "test_data", "dummy_module1.py"
+    )
+
+    module_paths = local_sources_watcher.get_module_paths(mock_module)
+    assert module_paths == {DUMMY_MODULE_1_FILE}
+
+
+def test_is_valid_path():
+    assert local_sources_watcher._is_valid_path(DUMMY_MODULE_1_FILE)
+    assert local_sources_watcher._is_valid_path(os.path.dirname(DUMMY_MODULE_1_FILE))
+    assert not local_sources_watcher._is_valid_path(DUMMY_MODULE_1_FILE + ".missing")
+    assert not local_sources_watcher._is_valid_path(None)
+
+
+def test_get_module_paths_is_cached():
+    module = types.ModuleType("cached_module")
+    module.__file__ = DUMMY_MODULE_1_FILE
+
+    module_paths = local_sources_watcher.get_module_paths(module)
+    assert module_paths == {DUMMY_MODULE_1_FILE}
+
+    with patch(
+        "streamlit.watcher.local_sources_watcher._is_valid_path"
+    ) as is_valid_path:
+        assert local_sources_watcher.get_module_paths(module) == module_paths
+        is_valid_path.assert_not_called()
+
+    # Entries are evicted once their module is garbage collected.
+    module_id = id(module)
+    del module
+    gc.collect()
+    assert module_id not in local_sources_watcher._MODULE_PATHS_CACHE
+
+
 def sort_args_list(args_list):
     return sorted(args_list, key=lambda args: args[0])